@@ -1,4 +1,6 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from typing import AsyncGenerator
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 import os
 from dotenv import load_dotenv
@@ -13,12 +15,21 @@ print(DATABASE_URL)
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,
-    pool_size=10,
-    max_overflow=15,
+    pool_size=20,
+    max_overflow=10,
     pool_recycle=1800,
     pool_pre_ping=True,
-    pool_timeout=30
+    pool_timeout=30,
+    insertmanyvalues_page_size=1000,
+    query_cache_size=1200
 )
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency yielding one session shared by all helpers of a request."""
+    async with async_session_maker() as session:
+        yield session
+
+
 Base = declarative_base()
@@ -1,11 +1,12 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum as PythonEnum
 from typing import List, Optional
 
-from sqlalchemy import Integer, String, Float, DateTime, ForeignKey, Enum, Index
+from sqlalchemy import Integer, BigInteger, String, DateTime, ForeignKey, Enum, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from uuid6 import uuid7
 
 from alchemy.database import Base
 
@@ -26,10 +27,10 @@ class OrderStatus(PythonEnum):
 class Trader(Base):
     __tablename__ = 'traders'
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name: Mapped[str] = mapped_column(String, nullable=False)
     role: Mapped[TraderRole] = mapped_column(Enum(TraderRole), default=TraderRole.USER)
-    balance: Mapped[float] = mapped_column(Float, default=0.0)
+    balance: Mapped[int] = mapped_column(BigInteger, default=0)
     api_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
 
     # relations
@@ -52,10 +53,10 @@ class Trader(Base):
 class Position(Base):
     __tablename__ = 'positions'
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     trader_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('traders.id', ondelete="CASCADE"), nullable=False, index=True)
     symbol_ticker: Mapped[str] = mapped_column(String(10), ForeignKey('symbols.ticker', ondelete="CASCADE"), nullable=False, index=True)
-    quantity: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    quantity: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
 
     # relations
     trader: Mapped['Trader'] = relationship("Trader", back_populates="positions")
@@ -68,7 +69,7 @@ class Position(Base):
 class Order(Base):
     __tablename__ = 'orders'
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     trader_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('traders.id', ondelete="CASCADE"), nullable=False, index=True)
     symbol_ticker: Mapped[str] = mapped_column(String(10), ForeignKey('symbols.ticker', ondelete="CASCADE"), nullable=False, index=True)
     amount: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -76,7 +77,7 @@ class Order(Base):
     price: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     direction: Mapped[OrderSide] = mapped_column(Enum(OrderSide), nullable=False)
     status: Mapped[OrderStatus] = mapped_column(Enum(OrderStatus), default=OrderStatus.NEW)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     # relations
     trader: Mapped['Trader'] = relationship("Trader", back_populates="orders")
@@ -93,13 +94,13 @@ class Order(Base):
 class Trade(Base):
     __tablename__ = 'trades'
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     trader_from_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey('traders.id', ondelete="SET NULL"), nullable=True, index=True)
     trader_to_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey('traders.id', ondelete="SET NULL"), nullable=True, index=True)
     symbol_ticker: Mapped[Optional[str]] = mapped_column(String(10), ForeignKey('symbols.ticker', ondelete="SET NULL"), nullable=True, index=True)
-    amount: Mapped[float] = mapped_column(Float, nullable=False)
-    price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    amount: Mapped[int] = mapped_column(Integer, nullable=False)
+    price: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     # relations
     from_trader: Mapped[Optional['Trader']] = relationship("Trader", foreign_keys=[trader_from_id], back_populates="trades_sent")
@@ -133,5 +134,26 @@ class Symbol(Base):
 
 # Helpful indexes (do not change logic; optimize common lookups)
 Index('ix_position_trader_symbol', Position.trader_id, Position.symbol_ticker, unique=True)
-Index('ix_order_symbol_status', Order.symbol_ticker, Order.status)
-Index('ix_trade_symbol_time', Trade.symbol_ticker, Trade.timestamp)
+# Only resting orders are ever read by symbol, so keep one index per side in book order
+Index(
+    'ix_orderbook_bid',
+    Order.symbol_ticker,
+    Order.price.desc().nulls_last(),
+    Order.created_at,
+    postgresql_where=text("status IN ('NEW', 'PARTIALLY_EXECUTED') AND direction = 'BID'"),
+    postgresql_include=['amount']
+)
+Index(
+    'ix_orderbook_ask',
+    Order.symbol_ticker,
+    Order.price.asc().nulls_last(),
+    Order.created_at,
+    postgresql_where=text("status IN ('NEW', 'PARTIALLY_EXECUTED') AND direction = 'ASK'"),
+    postgresql_include=['amount']
+)
+Index(
+    'ix_orders_trader_active',
+    Order.trader_id,
+    postgresql_where=text("status IN ('NEW', 'PARTIALLY_EXECUTED')")
+)
+Index('ix_trade_symbol_time', Trade.symbol_ticker, Trade.timestamp.desc())
@@ -1,7 +1,6 @@
 """
 Admin API endpoints - accessible only to administrators.
 """
-import os
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
@@ -13,10 +12,9 @@ from api.v1.admin.schemas import (
 )
 from api.v1.auth.jwt import get_current_admin
 from db_utils.symbol import create_symbol, get_symbol_by_ticker, delete_symbol
-from db_utils.trader import get_trader, change_trader_balance, delete_trader
+from db_utils.trader import change_trader_balance, delete_trader
 from alchemy.models import Trader, Symbol
-from depends import get_symbol_depend, get_user_depend
-
+from depends import get_balance_change_depend, get_symbol_depend, get_user_depend
 
 router = APIRouter()
 
@@ -69,60 +67,61 @@ async def delete_symbol_endpoint(
     return SuccessResponse(success=True)
 
 
-@router.post('/balance/deposit', response_model=SuccessResponse)
-async def deposit_balance(
-    balance_data: BalanceChangeRequest,
-    admin: Trader = Depends(get_current_admin)
-) -> SuccessResponse:
+async def _change_balance(balance_data: BalanceChangeRequest, amount: int) -> SuccessResponse:
     """
-    Deposit balance to a trader's account (admin only).
+    Apply a signed balance change shared by the deposit and withdraw endpoints.
     
     Args:
         balance_data: Balance change data
-        admin: Authenticated admin trader
+        amount: Signed amount to add to the trader's balance
         
     Returns:
         Success response
         
     Raises:
-        HTTPException: 404 if trader or symbol not found
+        HTTPException: 404 if trader not found
     """
-    trader = await get_trader(str(balance_data.trader_id))
-    if not trader:
+    changed = await change_trader_balance(balance_data.trader_id, balance_data.ticker, amount)
+    if not changed:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Trader not found"
         )
     
-    # Validate symbol if not base currency
-    base_symbol = os.getenv('BASE_SYMBOL')
-    if balance_data.ticker != base_symbol:
-        symbol = await get_symbol_by_ticker(balance_data.ticker)
-        if not symbol:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Symbol not found"
-            )
-    
-    await change_trader_balance(
-        str(balance_data.trader_id),
-        balance_data.ticker,
-        balance_data.amount
-    )
-    
     return SuccessResponse(success=True)
 
 
+@router.post('/balance/deposit', response_model=SuccessResponse)
+async def deposit_balance(
+    balance_data: BalanceChangeRequest = Depends(get_balance_change_depend),
+    admin: Trader = Depends(get_current_admin)
+) -> SuccessResponse:
+    """
+    Deposit balance to a trader's account (admin only).
+    
+    Args:
+        balance_data: Balance change data with a validated ticker
+        admin: Authenticated admin trader
+        
+    Returns:
+        Success response
+        
+    Raises:
+        HTTPException: 404 if trader or symbol not found
+    """
+    return await _change_balance(balance_data, balance_data.amount)
+
+
 @router.post('/balance/withdraw', response_model=SuccessResponse)
 async def withdraw_balance(
-    balance_data: BalanceChangeRequest,
+    balance_data: BalanceChangeRequest = Depends(get_balance_change_depend),
     admin: Trader = Depends(get_current_admin)
 ) -> SuccessResponse:
     """
     Withdraw balance from a trader's account (admin only).
     
     Args:
-        balance_data: Balance change data (amount will be withdrawn)
+        balance_data: Balance change data with a validated ticker (amount will be withdrawn)
         admin: Authenticated admin trader
         
     Returns:
@@ -131,30 +130,7 @@ async def withdraw_balance(
     Raises:
         HTTPException: 404 if trader or symbol not found
     """
-    trader = await get_trader(str(balance_data.trader_id))
-    if not trader:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Trader not found"
-        )
-    
-    # Validate symbol if not base currency
-    base_symbol = os.getenv('BASE_SYMBOL')
-    if balance_data.ticker != base_symbol:
-        symbol = await get_symbol_by_ticker(balance_data.ticker)
-        if not symbol:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Symbol not found"
-            )
-    
-    await change_trader_balance(
-        str(balance_data.trader_id),
-        balance_data.ticker,
-        -balance_data.amount
-    )
-    
-    return SuccessResponse(success=True)
+    return await _change_balance(balance_data, -balance_data.amount)
 
 
 @router.delete('/user/{user_id}', response_model=TraderDeleteResponse)
@@ -1,7 +1,7 @@
 from uuid import UUID
 from typing import Optional
 
-from pydantic import BaseModel, Field, constr, field_validator
+from pydantic import BaseModel, Field, constr
 
 
 class SymbolCreateRequest(BaseModel):
@@ -16,14 +16,6 @@ class BalanceChangeRequest(BaseModel):
     ticker: constr(min_length=2, max_length=10, pattern="^[A-Z]+$") = Field(..., description="Symbol ticker")
     amount: int = Field(..., gt=0, description="Amount to change")
 
-    @field_validator('amount')
-    @classmethod
-    def validate_amount(cls, value: int) -> int:
-        """Validate that amount is positive."""
-        if value <= 0:
-            raise ValueError("Amount must be greater than 0")
-        return value
-
 
 class TraderDeleteResponse(BaseModel):
     """Response schema for trader deletion."""
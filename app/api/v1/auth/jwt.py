@@ -1,8 +1,9 @@
-import asyncio
+import time
 
 import jwt
+from cachetools import TLRUCache
 from datetime import datetime, timedelta
-from db_utils.trader import get_trader, apply_trader_api_key
+from db_utils.trader import get_cached_trader
 from fastapi import HTTPException, Depends, Request, status
 import os
 from alchemy.models import Trader, TraderRole
@@ -34,9 +35,27 @@ class OAuth2TokenWithPrefix:
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("JWT_ALGORITHM")
+TOKEN_CACHE_TTL = 60
 oauth2_scheme = OAuth2TokenWithPrefix(token_prefix="TOKEN")
 
 
+def _token_ttu(token: str, payload: dict, now: float) -> float:
+    """Keep a decoded token for at most TOKEN_CACHE_TTL seconds and never past its exp."""
+    return min(now + TOKEN_CACHE_TTL, payload.get("exp", now))
+
+
+# Decoded payloads keyed by the raw token, so repeat requests skip HMAC verification
+_token_cache = TLRUCache(maxsize=10_000, ttu=_token_ttu, timer=time.time)
+
+
+def _decode_cached(token: str) -> dict:
+    payload = _token_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        _token_cache[token] = payload
+    return payload
+
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     if expires_delta:
@@ -45,28 +64,33 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    asyncio.get_running_loop().create_task(apply_trader_api_key(data['id'], encoded_jwt))
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> Trader:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=401,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "TOKEN"},
     )
+
+
+def _get_token_payload(token: str) -> dict:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        id_: str = payload.get("id")
-        if id_ is None:
-            raise credentials_exception
-    except jwt.exceptions.PyJWTError as e:
-        raise credentials_exception
+        payload = _decode_cached(token)
+    except jwt.exceptions.PyJWTError:
+        raise _credentials_exception()
+    if payload.get("id") is None:
+        raise _credentials_exception()
+    return payload
+
 
-    trader = await get_trader(id_)
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Trader:
+    id_: str = _get_token_payload(token)["id"]
+    trader = await get_cached_trader(id_)
     if trader:
         return trader
-    raise credentials_exception
+    raise _credentials_exception()
 
 async def get_current_admin(trader: Trader = Depends(get_current_user)) -> Trader:
     if trader.role != TraderRole.ADMIN:
@@ -2,22 +2,23 @@
 Order management API endpoints.
 """
 import uuid
-from datetime import timezone
-from typing import List
+from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from alchemy.database import get_db
 from api.v1.auth.jwt import get_current_user
+from api.v1.utils import format_timestamp, format_uuid
 from db_utils.symbol import get_symbol_by_ticker
 from db_utils.order import (
     create_limit_sell_order,
     create_limit_buy_order,
-    create_market_buy_order,
-    create_market_sell_order,
     cancel_order,
     get_order
 )
-from db_utils.trader import get_trader_orders
+from db_utils.trader import __get_trader_orders
 from alchemy.models import Trader, OrderStatus, OrderSide, Order
 from .schemas import (
     CreateOrderRequest,
@@ -30,6 +31,42 @@ from .schemas import (
 
 router = APIRouter()
 
+# A market order is a limit order without a price
+ORDER_CREATORS = {
+    'BUY': create_limit_buy_order,
+    'SELL': create_limit_sell_order,
+}
+
+
+def _format_direction(order: Order) -> str:
+    """Map an order side to the API direction name."""
+    return "BUY" if order.direction == OrderSide.BID else "SELL"
+
+
+def _format_order_response_dict(order: Order) -> Dict[str, Any]:
+    """
+    Format order model to a plain dict shaped like OrderResponse for ORJSONResponse.
+    
+    Args:
+        order: Order database model
+        
+    Returns:
+        Order response data
+    """
+    return {
+        'id': format_uuid(order.id),
+        'status': order.status.value,
+        'trader_id': format_uuid(order.trader_id),
+        'timestamp': format_timestamp(order.created_at),
+        'body': {
+            'direction': _format_direction(order),
+            'symbol_ticker': order.symbol_ticker,
+            'qty': order.amount + order.filled,
+            'price': order.price
+        },
+        'filled': order.filled
+    }
+
 
 def _format_order_response(order: Order) -> OrderResponse:
     """
@@ -41,18 +78,13 @@ def _format_order_response(order: Order) -> OrderResponse:
     Returns:
         Formatted order response
     """
-    timestamp_utc = order.created_at.astimezone(timezone.utc)
-    formatted_timestamp = timestamp_utc.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
-    
-    direction_str = "BUY" if order.direction == OrderSide.BID else "SELL"
-    
-    return OrderResponse(
+    return OrderResponse.model_construct(
         id=order.id,
         status=order.status.value,
         trader_id=order.trader_id,
-        timestamp=formatted_timestamp,
-        body=OrderBodyResponse(
-            direction=direction_str,
+        timestamp=format_timestamp(order.created_at),
+        body=OrderBodyResponse.model_construct(
+            direction=_format_direction(order),
             symbol_ticker=order.symbol_ticker,
             qty=order.amount + order.filled,
             price=order.price
@@ -62,18 +94,22 @@ def _format_order_response(order: Order) -> OrderResponse:
 
 
 @router.get('', response_model=List[OrderResponse])
-async def list_orders(trader: Trader = Depends(get_current_user)) -> List[OrderResponse]:
+async def list_orders(
+    trader: Trader = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> ORJSONResponse:
     """
     Get all orders for the authenticated trader.
     
     Args:
         trader: Authenticated trader from JWT token
+        db: Database session for this request
         
     Returns:
-        List of all trader's orders
+        List of all trader's orders, serialized from plain dicts
     """
-    orders = await get_trader_orders(str(trader.id))
-    return [_format_order_response(order) for order in orders]
+    orders = await __get_trader_orders(db, trader.id)
+    return ORJSONResponse(content=[_format_order_response_dict(order) for order in orders])
 
 
 @router.get('/{order_id}', response_model=OrderResponse)
@@ -162,36 +198,13 @@ async def create_order(
             detail="Symbol not found"
         )
     
-    # Determine order type and create order
-    created_order = None
-    if order_data.direction == 'BUY':
-        if order_data.price:
-            created_order = await create_limit_buy_order(
-                order_data.ticker,
-                order_data.qty,
-                order_data.price,
-                trader
-            )
-        else:
-            created_order = await create_market_buy_order(
-                order_data.ticker,
-                order_data.qty,
-                trader
-            )
-    elif order_data.direction == 'SELL':
-        if order_data.price:
-            created_order = await create_limit_sell_order(
-                order_data.ticker,
-                order_data.qty,
-                order_data.price,
-                trader
-            )
-        else:
-            created_order = await create_market_sell_order(
-                order_data.ticker,
-                order_data.qty,
-                trader
-            )
+    create_order_for_direction = ORDER_CREATORS[order_data.direction]
+    created_order = await create_order_for_direction(
+        order_data.ticker,
+        order_data.qty,
+        order_data.price,
+        trader
+    )
     
     if not created_order or created_order.status == OrderStatus.CANCELLED:
         raise HTTPException(
@@ -1,25 +1,16 @@
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, constr, conint, field_validator
+from pydantic import BaseModel, Field, constr, conint
 
 
 class CreateOrderRequest(BaseModel):
     """Request schema for creating an order."""
-    direction: str = Field(..., description="Order direction: BUY or SELL")
+    direction: Literal['BUY', 'SELL'] = Field(..., description="Order direction: BUY or SELL")
     ticker: constr(min_length=2, max_length=10, pattern="^[A-Z]+$") = Field(..., description="Symbol ticker")
     qty: conint(gt=0) = Field(..., description="Order quantity")
     price: Optional[conint(gt=0)] = Field(None, description="Order price (required for limit orders)")
 
-    @field_validator('direction')
-    @classmethod
-    def validate_direction(cls, value: str) -> str:
-        """Validate order direction."""
-        directions = ['BUY', 'SELL']
-        if value.upper() not in directions:
-            raise ValueError(f"Direction must be one of {directions}")
-        return value.upper()
-
 
 class OrderBodyResponse(BaseModel):
     """Response schema for order body details."""
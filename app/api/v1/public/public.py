@@ -1,24 +1,24 @@
 """
 Public API endpoints - accessible without authentication.
 """
-from datetime import timezone
-from collections import defaultdict
-from typing import List
+import asyncio
+from typing import Dict, List
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, BackgroundTasks, Depends, status
+from fastapi.responses import ORJSONResponse
 
 from api.v1.auth.jwt import create_access_token
+from api.v1.utils import format_timestamp
 from depends import get_symbol_depend
 from alchemy.models import OrderSide, Symbol
-from db_utils.trader import create_trader
+from db_utils.trader import create_trader, apply_trader_api_key
 from db_utils.symbol import get_all_symbols
-from db_utils.order import get_orders
+from db_utils.order import get_orderbook_levels
 from db_utils.trade import get_trades_by_ticker
 from .schemas import (
     TraderAuth,
     RegisterResponse,
     SymbolResponse,
-    OrderLevelResponse,
     OrderBookResponse,
     TradeResponse
 )
@@ -28,12 +28,13 @@ router = APIRouter()
 
 
 @router.post('/register', response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
-async def register(trader_data: TraderAuth) -> RegisterResponse:
+async def register(trader_data: TraderAuth, background_tasks: BackgroundTasks) -> RegisterResponse:
     """
     Register a new trader.
     
     Args:
         trader_data: Trader registration data
+        background_tasks: Tasks run after the response is sent
         
     Returns:
         Registration response with trader info and API key
@@ -46,8 +47,9 @@ async def register(trader_data: TraderAuth) -> RegisterResponse:
         "role": trader.role.name
     }
     api_key = create_access_token(token_data)
+    background_tasks.add_task(apply_trader_api_key, trader.id, api_key)
     
-    return RegisterResponse(
+    return RegisterResponse.model_construct(
         name=trader.name,
         id=trader.id,
         role=trader.role.name,
@@ -64,14 +66,14 @@ async def get_symbols() -> List[SymbolResponse]:
         List of symbols with name and ticker
     """
     symbols = await get_all_symbols()
-    return [SymbolResponse(name=symbol.name, ticker=symbol.ticker) for symbol in symbols]
+    return [SymbolResponse.model_construct(name=symbol.name, ticker=symbol.ticker) for symbol in symbols]
 
 
 @router.get('/orderbook/{ticker}', response_model=OrderBookResponse)
 async def get_orderbook(
     symbol: Symbol = Depends(get_symbol_depend),
     limit: int = 10
-) -> OrderBookResponse:
+) -> ORJSONResponse:
     """
     Get order book for a symbol.
     
@@ -84,34 +86,25 @@ async def get_orderbook(
     """
     ticker = symbol.ticker
 
-    async def aggregate_orders(direction: OrderSide) -> List[OrderLevelResponse]:
-        """Aggregate orders by price for a given direction."""
-        orders = await get_orders(ticker, direction, limit=limit)
-        aggregated = defaultdict(int)
-        for order in orders:
-            if order.price:
-                aggregated[order.price] += order.amount
-        
-        sorted_items = sorted(
-            aggregated.items(),
-            reverse=(direction == OrderSide.BID)
-        )
-        return [
-            OrderLevelResponse(price=price, qty=qty)
-            for price, qty in sorted_items
-        ]
+    async def aggregate_orders(direction: OrderSide) -> List[Dict[str, int]]:
+        """Get price levels for a given direction, aggregated in the database."""
+        levels = await get_orderbook_levels(ticker, direction, limit=limit)
+        return [{'price': price, 'qty': qty} for price, qty in levels]
 
-    bid_levels = await aggregate_orders(OrderSide.BID)
-    ask_levels = await aggregate_orders(OrderSide.ASK)
+    # Each side runs in its own session, so both queries are in flight at once
+    bid_levels, ask_levels = await asyncio.gather(
+        aggregate_orders(OrderSide.BID),
+        aggregate_orders(OrderSide.ASK)
+    )
 
-    return OrderBookResponse(bid_levels=bid_levels, ask_levels=ask_levels)
+    return ORJSONResponse(content={'bid_levels': bid_levels, 'ask_levels': ask_levels})
 
 
 @router.get('/transactions/{ticker}', response_model=List[TradeResponse])
 async def get_trades(
     symbol: Symbol = Depends(get_symbol_depend),
     limit: int = 10
-) -> List[TradeResponse]:
+) -> ORJSONResponse:
     """
     Get recent trades for a symbol.
     
@@ -125,14 +118,12 @@ async def get_trades(
     ticker = symbol.ticker
     trades = await get_trades_by_ticker(ticker, limit)
     
-    return [
-        TradeResponse(
-            symbol_ticker=trade.symbol_ticker or ticker,
-            amount=trade.amount,
-            price=trade.price,
-            timestamp=trade.timestamp.astimezone(timezone.utc).isoformat(
-                timespec='milliseconds'
-            ).replace('+00:00', 'Z')
-        )
+    return ORJSONResponse(content=[
+        {
+            'symbol_ticker': trade.symbol_ticker or ticker,
+            'amount': trade.amount,
+            'price': trade.price,
+            'timestamp': format_timestamp(trade.timestamp)
+        }
         for trade in trades
-    ]
+    ])
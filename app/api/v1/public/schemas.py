@@ -36,8 +36,8 @@ class OrderBookResponse(BaseModel):
 class TradeResponse(BaseModel):
     """Response schema for trade information."""
     symbol_ticker: str = Field(..., description="Symbol ticker")
-    amount: float = Field(..., description="Trade amount")
-    price: float | None = Field(None, description="Trade price")
+    amount: int = Field(..., description="Trade amount")
+    price: int | None = Field(None, description="Trade price")
     timestamp: str = Field(..., description="Trade timestamp in ISO format")
 
     class Config:
@@ -0,0 +1,12 @@
+from datetime import datetime
+from uuid import UUID
+
+
+def format_timestamp(timestamp: datetime) -> str:
+    """Format a UTC timestamp as ISO 8601 with milliseconds and a Z suffix."""
+    return timestamp.strftime('%Y-%m-%dT%H:%M:%S.') + f'{timestamp.microsecond // 1000:03d}Z'
+
+
+def format_uuid(value: UUID) -> str:
+    """Format an id for ORJSONResponse content, which cannot serialize uuid6.UUID."""
+    return str(value)
@@ -1,19 +1,29 @@
-import os
+import logging
 from uuid import UUID
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import select, asc, desc, delete
+from sqlalchemy import (
+    BigInteger, select, insert, update, asc, desc, delete, func, case, cast, literal, lambda_stmt, union_all
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-
-from db_utils.trader import __change_balance
+from sqlalchemy.orm import raiseload
+
+from db_utils.trader import (
+    BASE_CURRENCY_TICKER,
+    __build_balance_update,
+    __change_balance,
+    invalidate_cached_trader
+)
 from alchemy.database import async_session_maker
 from alchemy.models import Order, OrderSide, Trader, OrderStatus, Trade, Position
 
 
-BASE_CURRENCY_TICKER = os.getenv('BASE_SYMBOL')
-FINAL_ORDER_STATUSES = {OrderStatus.PARTIALLY_EXECUTED, OrderStatus.EXECUTED, OrderStatus.CANCELLED}
-ACTIVE_ORDER_STATUSES = [OrderStatus.NEW, OrderStatus.PARTIALLY_EXECUTED]
+logger = logging.getLogger(__name__)
+
+FINAL_ORDER_STATUSES = frozenset({OrderStatus.PARTIALLY_EXECUTED, OrderStatus.EXECUTED, OrderStatus.CANCELLED})
+# Tuple rather than a set so Column.in_() renders its parameters in a stable order
+ACTIVE_ORDER_STATUSES = (OrderStatus.NEW, OrderStatus.PARTIALLY_EXECUTED)
 
 
 async def delete_all_orders() -> None:
@@ -49,17 +59,15 @@ async def cancel_order(order_id: str, trader_id: UUID) -> Optional[Order]:
             await __change_balance(session, order.trader_id, BASE_CURRENCY_TICKER, order.amount * order.price)
         
         order.status = OrderStatus.CANCELLED
-        session.add(order)
-        await session.flush()
-        await session.refresh(order)
         await session.commit()
+        invalidate_cached_trader(order.trader_id)
         return order
 
 
 async def get_order(order_id: str) -> Optional[Order]:
     """Get order by ID."""
     async with async_session_maker() as session:
-        query = select(Order).where(Order.id == order_id)
+        query = lambda_stmt(lambda: select(Order).where(Order.id == order_id))
         result = await session.execute(query)
         return result.scalars().first()
 
@@ -70,30 +78,113 @@ async def get_orders(symbol_ticker: str, direction: OrderSide, limit: int = 10)
         return await __get_orders(session, symbol_ticker, direction, limit)
 
 
+async def __get_trader_balance(session: AsyncSession, trader_id: UUID) -> Dict[str, int]:
+    """Internal helper to sum a trader's holdings and frozen funds per ticker in one query."""
+    active_orders = (
+        Order.trader_id == trader_id,
+        Order.status.in_(ACTIVE_ORDER_STATUSES)
+    )
+    holdings = union_all(
+        select(Position.symbol_ticker.label('ticker'), Position.quantity.label('quantity'))
+        .where(Position.trader_id == trader_id),
+        select(literal(BASE_CURRENCY_TICKER), Trader.balance)
+        .where(Trader.id == trader_id),
+        # Sell orders freeze instruments
+        select(Order.symbol_ticker, func.sum(Order.amount))
+        .where(*active_orders, Order.direction == OrderSide.ASK.name)
+        .group_by(Order.symbol_ticker),
+        # Buy orders freeze base currency; market orders never rest in the book
+        select(literal(BASE_CURRENCY_TICKER), func.sum(cast(Order.amount, BigInteger) * Order.price))
+        .where(*active_orders, Order.direction == OrderSide.BID.name, Order.price.is_not(None))
+    ).subquery()
+    query = (
+        select(holdings.c.ticker, cast(func.sum(holdings.c.quantity), BigInteger))
+        .group_by(holdings.c.ticker)
+    )
+    result = await session.execute(query)
+    return dict(result.all())
+
+
+async def get_orderbook_levels(
+    symbol_ticker: str,
+    direction: OrderSide,
+    limit: int = 10
+) -> List[Tuple[int, int]]:
+    """Get active order quantity aggregated by price, best price first."""
+    async with async_session_maker() as session:
+        direction_name = direction.name
+        query = lambda_stmt(
+            lambda: select(Order.price, func.sum(Order.amount))
+            .filter(
+                Order.symbol_ticker == symbol_ticker,
+                Order.direction == direction_name,
+                Order.status.in_(ACTIVE_ORDER_STATUSES),
+                Order.price.is_not(None)
+            )
+            .group_by(Order.price)
+        )
+        # One cached statement per side: the sort order must not depend on a bound value
+        if direction == OrderSide.BID:
+            query += lambda stmt: stmt.order_by(desc(Order.price).nulls_last())
+        else:
+            query += lambda stmt: stmt.order_by(asc(Order.price).nulls_last())
+        query += lambda stmt: stmt.limit(limit)
+        result = await session.execute(query)
+        return result.all()
+
+
 async def __get_orders(
     session: AsyncSession,
     symbol_ticker: str,
     direction: OrderSide,
-    limit: int = 10
+    limit: int = 10,
+    for_update: bool = False
 ) -> List[Order]:
-    """Internal helper to get orders from orderbook."""
-    query = (
-        select(Order)
+    """Internal helper to get orders from orderbook, optionally locking them for matching."""
+    direction_name = direction.name
+    query = lambda_stmt(
+        lambda: select(Order)
         .filter(
             Order.symbol_ticker == symbol_ticker,
-            Order.direction == direction.name,
+            Order.direction == direction_name,
             Order.status.in_(ACTIVE_ORDER_STATUSES)
         )
-        .order_by(
-            desc(Order.price) if direction == OrderSide.BID else asc(Order.price),
-            Order.created_at
-        )
-        .limit(limit)
+        .options(raiseload('*'))
     )
+    # One cached statement per side, as in get_orderbook_levels
+    if direction == OrderSide.BID:
+        query += lambda stmt: stmt.order_by(desc(Order.price).nulls_last(), Order.created_at)
+    else:
+        query += lambda stmt: stmt.order_by(asc(Order.price).nulls_last(), Order.created_at)
+    query += lambda stmt: stmt.limit(limit)
+    if for_update:
+        # Orders locked by a concurrent matching run are left to that run
+        query += lambda stmt: stmt.with_for_update(skip_locked=True)
     result = await session.execute(query)
     return result.scalars().all()
 
 
+async def __insert_cancelled_order(
+    session: AsyncSession,
+    trader_id: UUID,
+    symbol_ticker: str,
+    quantity: int,
+    price: Optional[int],
+    direction: OrderSide
+) -> Order:
+    """Internal helper to record a rejected order as cancelled with a single INSERT."""
+    query = insert(Order).values(
+        trader_id=trader_id,
+        symbol_ticker=symbol_ticker,
+        amount=quantity,
+        filled=0,
+        price=price,
+        direction=direction,
+        status=OrderStatus.CANCELLED
+    ).returning(Order)
+    return (await session.execute(query)).scalar_one()
+
+
 async def create_limit_buy_order(
     symbol_ticker: str,
     quantity: int,
@@ -102,7 +193,7 @@ async def create_limit_buy_order(
 ) -> Order:
     """Create a limit buy order and try to match it immediately."""
     async with async_session_maker() as session:
-        orderbook = await __get_orders(session, symbol_ticker, OrderSide.ASK, quantity)
+        orderbook = await __get_orders(session, symbol_ticker, OrderSide.ASK, quantity, for_update=True)
         
         new_order = Order(
             trader_id=trader.id,
@@ -114,6 +205,9 @@ async def create_limit_buy_order(
             status=OrderStatus.NEW
         )
         
+        trade_rows: List[Dict[str, Any]] = []
+        balance_deltas: Dict[UUID, int] = {}
+        position_deltas: Dict[UUID, int] = {}
         try:
             # Match orders from orderbook
             for matching_order in orderbook:
@@ -121,17 +215,25 @@ async def create_limit_buy_order(
                     break
                 
                 quantity_to_buy = min(matching_order.amount, new_order.amount)
-                await buy(
+                trade_row = await buy(
                     session,
+                    balance_deltas,
+                    position_deltas,
                     matching_order.trader_id,
                     trader.id,
                     symbol_ticker,
                     matching_order.price,
                     quantity_to_buy
                 )
+                trade_rows.append(trade_row)
                 await partially_execute_order(session, matching_order, quantity_to_buy)
                 await partially_execute_order(session, new_order, quantity_to_buy)
 
+            if trade_rows:
+                await session.execute(insert(Trade), trade_rows)
+            await __apply_balance_deltas(session, balance_deltas)
+            await __apply_position_deltas(session, symbol_ticker, position_deltas)
+
             # Freeze balance for remaining order amount
             if new_order.status != OrderStatus.EXECUTED:
                 if price is not None:
@@ -146,18 +248,18 @@ async def create_limit_buy_order(
 
             session.add(new_order)
             await session.commit()
+            invalidate_cached_trader(trader.id, *(order.trader_id for order in orderbook))
             return new_order
 
         except Exception as e:
             # Insufficient funds
-            print(e)
+            logger.warning('order rejected', exc_info=e)
             await session.rollback()
-            new_order.filled = 0
-            new_order.amount = quantity
-            new_order.status = OrderStatus.CANCELLED
-            session.add(new_order)
+            cancelled_order = await __insert_cancelled_order(
+                session, trader.id, symbol_ticker, quantity, price, OrderSide.BID
+            )
             await session.commit()
-            return new_order
+            return cancelled_order
 
 
 async def create_limit_sell_order(
@@ -168,7 +270,7 @@ async def create_limit_sell_order(
 ) -> Order:
     """Create a limit sell order and try to match it immediately."""
     async with async_session_maker() as session:
-        orderbook = await __get_orders(session, symbol_ticker, OrderSide.BID, quantity)
+        orderbook = await __get_orders(session, symbol_ticker, OrderSide.BID, quantity, for_update=True)
         
         new_order = Order(
             trader_id=trader.id,
@@ -180,6 +282,9 @@ async def create_limit_sell_order(
             status=OrderStatus.NEW
         )
         
+        trade_rows: List[Dict[str, Any]] = []
+        balance_deltas: Dict[UUID, int] = {}
+        position_deltas: Dict[UUID, int] = {}
         try:
             # Match orders from orderbook
             for matching_order in orderbook:
@@ -187,17 +292,25 @@ async def create_limit_sell_order(
                     break
                 
                 quantity_to_sell = min(matching_order.amount, new_order.amount)
-                await sell(
+                trade_row = await sell(
                     session,
+                    balance_deltas,
+                    position_deltas,
                     trader.id,
                     matching_order.trader_id,
                     symbol_ticker,
                     matching_order.price,
                     quantity_to_sell
                 )
+                trade_rows.append(trade_row)
                 await partially_execute_order(session, matching_order, quantity_to_sell)
                 await partially_execute_order(session, new_order, quantity_to_sell)
 
+            if trade_rows:
+                await session.execute(insert(Trade), trade_rows)
+            await __apply_balance_deltas(session, balance_deltas)
+            await __apply_position_deltas(session, symbol_ticker, position_deltas)
+
             # Freeze instruments for remaining order amount
             if new_order.status != OrderStatus.EXECUTED:
                 if price is not None:
@@ -207,117 +320,129 @@ async def create_limit_sell_order(
 
             session.add(new_order)
             await session.commit()
+            invalidate_cached_trader(trader.id, *(order.trader_id for order in orderbook))
             return new_order
 
         except Exception as e:
             # Insufficient instruments
-            print(e)
+            logger.warning('order rejected', exc_info=e)
             await session.rollback()
-            new_order.filled = 0
-            new_order.amount = quantity
-            new_order.status = OrderStatus.CANCELLED
-            session.add(new_order)
+            cancelled_order = await __insert_cancelled_order(
+                session, trader.id, symbol_ticker, quantity, price, OrderSide.ASK
+            )
             await session.commit()
-            return new_order
-
-
-async def create_market_buy_order(
-    symbol_ticker: str,
-    quantity: int,
-    trader: Trader
-) -> Order:
-    """Create a market buy order."""
-    return await create_limit_buy_order(symbol_ticker, quantity, None, trader)
-
-
-async def create_market_sell_order(
-    symbol_ticker: str,
-    quantity: int,
-    trader: Trader
-) -> Order:
-    """Create a market sell order."""
-    return await create_limit_sell_order(symbol_ticker, quantity, None, trader)
+            return cancelled_order
 
 
 async def buy(
     session: AsyncSession,
+    balance_deltas: Dict[UUID, int],
+    position_deltas: Dict[UUID, int],
     seller_id: UUID,
     buyer_id: UUID,
     symbol_ticker: str,
     price: int,
     amount: int
-) -> Trade:
-    """Execute a buy trade: transfer symbol from seller to buyer and update balances."""
-    buyer_trader = await session.get(Trader, buyer_id)
-    seller_trader = await session.get(Trader, seller_id)
-
-    query = select(Position).where(
-        Position.trader_id == buyer_id,
-        Position.symbol_ticker == symbol_ticker
-    )
-    buyer_position = (await session.execute(query)).scalars().first()
-
-    if buyer_trader.balance < amount * price:
-        raise Exception('Not enough balance')
-
-    trade_record = Trade(
+) -> Dict[str, Any]:
+    """Execute a buy trade: transfer symbol from seller to buyer and update balances.
+
+    Balance and position changes are accumulated in the delta dicts and the
+    Trade row is returned; the caller writes all of them for the whole
+    matching run at once. The seller's instruments are already frozen.
+    """
+    trade_row = dict(
         trader_from_id=seller_id,
         trader_to_id=buyer_id,
         symbol_ticker=symbol_ticker,
         amount=amount,
         price=price
     )
-    session.add(trade_record)
     
-    seller_trader.balance += amount * price
-    buyer_trader.balance -= amount * price
-    buyer_position.quantity += amount
+    balance_deltas[seller_id] = balance_deltas.get(seller_id, 0) + amount * price
+    balance_deltas[buyer_id] = balance_deltas.get(buyer_id, 0) - amount * price
+    position_deltas[buyer_id] = position_deltas.get(buyer_id, 0) + amount
 
-    await session.flush()
-    return trade_record
+    return trade_row
 
 
 async def sell(
     session: AsyncSession,
+    balance_deltas: Dict[UUID, int],
+    position_deltas: Dict[UUID, int],
     seller_id: UUID,
     buyer_id: UUID,
     symbol_ticker: str,
     price: int,
     amount: int
-) -> Trade:
-    """Execute a sell trade: transfer symbol from seller to buyer and update balances."""
-    seller_trader = await session.get(Trader, seller_id)
-
-    seller_query = select(Position).where(
-        Position.trader_id == seller_id,
-        Position.symbol_ticker == symbol_ticker
-    )
-    seller_position = (await session.execute(seller_query)).scalars().first()
-
-    buyer_query = select(Position).where(
-        Position.trader_id == buyer_id,
-        Position.symbol_ticker == symbol_ticker
-    )
-    buyer_position = (await session.execute(buyer_query)).scalars().first()
-
-    if seller_position.quantity < amount:
-        raise Exception('Not enough instruments')
-
-    trade_record = Trade(
+) -> Dict[str, Any]:
+    """Execute a sell trade: transfer symbol from seller to buyer and update balances.
+
+    Balance and position changes are accumulated in the delta dicts and the
+    Trade row is returned; the caller writes all of them for the whole
+    matching run at once. The buyer's funds are already frozen.
+    """
+    trade_row = dict(
         trader_from_id=seller_id,
         trader_to_id=buyer_id,
         symbol_ticker=symbol_ticker,
         amount=amount,
         price=price
     )
-    session.add(trade_record)
     
-    seller_trader.balance += amount * price
-    seller_position.quantity -= amount
-    buyer_position.quantity += amount
+    balance_deltas[seller_id] = balance_deltas.get(seller_id, 0) + amount * price
+    position_deltas[seller_id] = position_deltas.get(seller_id, 0) - amount
+    position_deltas[buyer_id] = position_deltas.get(buyer_id, 0) + amount
 
-    await session.flush()
-    return trade_record
+    return trade_row
+
+
+async def __apply_balance_deltas(session: AsyncSession, balance_deltas: Dict[UUID, int]) -> None:
+    """Internal helper to apply accumulated balance changes in one guarded UPDATE."""
+    if not balance_deltas:
+        return
+    # Bind deltas as bigint to match traders.balance; large notionals overflow int4
+    new_balance = Trader.balance + case(
+        {trader_id: literal(delta, BigInteger) for trader_id, delta in balance_deltas.items()},
+        value=Trader.id
+    )
+    query = (
+        update(Trader)
+        .where(Trader.id.in_(balance_deltas), new_balance >= 0)
+        .values(balance=new_balance)
+        .returning(Trader.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated_ids = (await session.execute(query)).scalars().all()
+    if len(updated_ids) != len(balance_deltas):
+        raise Exception('Not enough balance')
+
+
+async def __apply_position_deltas(
+    session: AsyncSession,
+    symbol_ticker: str,
+    position_deltas: Dict[UUID, int]
+) -> None:
+    """Internal helper to apply accumulated position changes in one guarded UPDATE."""
+    if not position_deltas:
+        return
+    new_quantity = Position.quantity + case(
+        {trader_id: literal(delta, BigInteger) for trader_id, delta in position_deltas.items()},
+        value=Position.trader_id
+    )
+    query = (
+        update(Position)
+        .where(
+            Position.trader_id.in_(position_deltas),
+            Position.symbol_ticker == symbol_ticker,
+            new_quantity >= 0
+        )
+        .values(quantity=new_quantity)
+        .returning(Position.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated_ids = (await session.execute(query)).scalars().all()
+    if len(updated_ids) != len(position_deltas):
+        raise Exception('Not enough instruments')
 
 
 async def partially_execute_order(
@@ -336,7 +461,6 @@ async def partially_execute_order(
         if order.amount == 0
         else OrderStatus.PARTIALLY_EXECUTED
     )
-    await session.flush()
 
 
 async def freeze_balance(
@@ -346,26 +470,9 @@ async def freeze_balance(
     amount: int
 ) -> None:
     """Freeze trader's balance or position for an order."""
-    trader = await session.get(Trader, trader_id)
-    
-    if symbol_ticker == BASE_CURRENCY_TICKER:
-        balance = trader.balance
-        if balance < amount:
-            raise Exception('Trader not enough balance/instruments')
-        trader.balance -= amount
-    else:
-        query = select(Position).where(
-            Position.trader_id == trader.id,
-            Position.symbol_ticker == symbol_ticker
-        )
-        position = (await session.execute(query)).scalars().first()
-        
-        balance = position.quantity
-        if balance < amount:
-            raise Exception('Trader not enough balance/instruments')
-        position.quantity -= amount
-    
-    await session.flush()
+    query = __build_balance_update(trader_id, symbol_ticker, -amount)
+    if (await session.execute(query)).first() is None:
+        raise Exception('Trader not enough balance/instruments')
 
 
 async def unfreeze_balance(
@@ -375,15 +482,4 @@ async def unfreeze_balance(
     amount: int
 ) -> None:
     """Unfreeze trader's balance or position after order cancellation."""
-    if symbol_ticker == BASE_CURRENCY_TICKER:
-        trader = await session.get(Trader, trader_id)
-        trader.balance += amount
-    else:
-        query = select(Position).where(
-            Position.trader_id == trader_id,
-            Position.symbol_ticker == symbol_ticker
-        )
-        position = (await session.execute(query)).scalars().first()
-        position.quantity += amount
-    
-    await session.flush()
+    await session.execute(__build_balance_update(trader_id, symbol_ticker, amount))
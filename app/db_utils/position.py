@@ -1,24 +1,47 @@
 import uuid
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from sqlalchemy import select
 from alchemy.database import async_session_maker
 from alchemy.models import Position
 
 
+async def __get_trader_positions(
+    session: AsyncSession,
+    trader_id: uuid.UUID,
+    symbol_ticker: Optional[str] = None
+) -> List[Position]:
+    """Internal helper to get trader's positions in an existing session."""
+    query = lambda_stmt(lambda: select(Position).where(Position.trader_id == trader_id))
+    
+    if symbol_ticker:
+        query += lambda stmt: stmt.where(Position.symbol_ticker == symbol_ticker)
+    
+    result = await session.execute(query)
+    return result.scalars().all()
+
+
+async def __create_positions(session: AsyncSession, positions: List[Dict[str, Any]]) -> None:
+    """Internal helper to insert position rows, skipping ones that already exist."""
+    if not positions:
+        return
+    # executemany form, so insertmanyvalues splits large batches into pages
+    query = pg_insert(Position).on_conflict_do_nothing(
+        index_elements=[Position.trader_id, Position.symbol_ticker]
+    )
+    await session.execute(query, positions)
+
+
 async def get_trader_positions(
     trader_id: uuid.UUID,
     symbol_ticker: Optional[str] = None
 ) -> List[Position]:
     """Get trader's positions, optionally filtered by symbol ticker."""
     async with async_session_maker() as session:
-        query = select(Position).where(Position.trader_id == trader_id)
-        
-        if symbol_ticker:
-            query = query.where(Position.symbol_ticker == symbol_ticker)
-        
-        result = await session.execute(query)
-        return result.scalars().all()
+        return await __get_trader_positions(session, trader_id, symbol_ticker)
 
 
 __all__ = ['get_trader_positions']
@@ -1,10 +1,15 @@
 from typing import Optional, List
 
+from async_lru import alru_cache
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import delete, lambda_stmt, select
 
 from alchemy.database import async_session_maker
-from alchemy.models import Symbol, Trader, Position
+from alchemy.models import Symbol, Trader
+from db_utils.position import __create_positions
+
+
+SYMBOL_CACHE_TTL = 300
 
 
 async def create_symbol(name: str, ticker: str) -> Symbol:
@@ -13,22 +18,26 @@ async def create_symbol(name: str, ticker: str) -> Symbol:
         new_symbol = Symbol(name=name, ticker=ticker)
         session.add(new_symbol)
 
-        result = await session.execute(select(Trader))
-        traders = result.scalars().all()
+        await session.flush()
 
-        for trader in traders:
-            position = Position(trader=trader, symbol=new_symbol, quantity=0.0)
-            session.add(position)
+        result = await session.execute(select(Trader.id))
+        positions = [
+            {'trader_id': trader_id, 'symbol_ticker': ticker, 'quantity': 0}
+            for trader_id in result.scalars().all()
+        ]
+        await __create_positions(session, positions)
 
         await session.commit()
+        get_symbol_by_ticker.cache_invalidate(ticker)
         await session.refresh(new_symbol)
         return new_symbol
 
 
+@alru_cache(maxsize=1024, ttl=SYMBOL_CACHE_TTL)
 async def get_symbol_by_ticker(ticker: str) -> Optional[Symbol]:
-    """Get symbol by ticker."""
+    """Get symbol by ticker; cached in-process and invalidated per ticker on create/delete."""
     async with async_session_maker() as session:
-        query = select(Symbol).where(Symbol.ticker == ticker)
+        query = lambda_stmt(lambda: select(Symbol).where(Symbol.ticker == ticker))
         result = await session.execute(query)
         return result.scalars().first()
 
@@ -36,7 +45,7 @@ async def get_symbol_by_ticker(ticker: str) -> Optional[Symbol]:
 async def delete_symbol(ticker: str) -> Symbol:
     """Delete symbol by ticker."""
     async with async_session_maker() as session:
-        symbol = await get_symbol_by_ticker(ticker)
+        symbol = await session.get(Symbol, ticker)
         if not symbol:
             raise HTTPException(
                 status_code=404,
@@ -44,14 +53,16 @@ async def delete_symbol(ticker: str) -> Symbol:
             )
         await session.delete(symbol)
         await session.commit()
+        get_symbol_by_ticker.cache_invalidate(ticker)
         return symbol
 
 
 async def delete_all_symbols() -> None:
     """Delete all symbols."""
-    symbols = await get_all_symbols()
-    for symbol in symbols:
-        await delete_symbol(symbol.ticker)
+    async with async_session_maker() as session:
+        await session.execute(delete(Symbol))
+        await session.commit()
+        get_symbol_by_ticker.cache_clear()
 
 
 async def get_all_symbols() -> List[Symbol]:
@@ -1,6 +1,7 @@
 from typing import List
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
 from alchemy.database import async_session_maker
 from alchemy.models import Trade, Symbol
@@ -14,6 +15,7 @@ async def get_trades_by_ticker(symbol_ticker: str, limit: int = 10) -> List[Trad
             .join(Trade.symbol)
             .filter(Symbol.ticker == symbol_ticker)
             .order_by(Trade.timestamp.desc())
+            .options(raiseload('*'))
             .limit(limit)
         )
         result = await session.execute(query)
@@ -25,7 +27,7 @@ async def create_trade(
     trader_to_id: str,
     symbol_ticker: str,
     amount: int,
-    price: float
+    price: int
 ) -> Trade:
     """Create a new trade record."""
     async with async_session_maker() as session:
@@ -48,7 +50,7 @@ async def __create_trade(
     trader_to_id: str,
     symbol_ticker: str,
     amount: int,
-    price: float
+    price: int
 ) -> Trade:
     """Internal helper to create trade without committing."""
     trade_entry = Trade(
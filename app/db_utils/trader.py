@@ -2,16 +2,24 @@ import os
 import uuid
 from typing import Optional, List, Union
 
+from cachetools import TTLCache
 from fastapi import HTTPException
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Update, lambda_stmt, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from alchemy.models import Trader, TraderRole, Symbol, Position, Order
 from alchemy.database import async_session_maker
+from db_utils.position import __create_positions
 
 
 BASE_CURRENCY_TICKER = os.getenv('BASE_SYMBOL')
+TRADER_CACHE_TTL = 5
+
+# Detached traders keyed by str(id) for the authentication hot path
+_trader_cache = TTLCache(maxsize=10_000, ttl=TRADER_CACHE_TTL)
 
 
 async def create_trader(name: str, role: TraderRole = TraderRole.USER) -> Trader:
@@ -20,12 +28,14 @@ async def create_trader(name: str, role: TraderRole = TraderRole.USER) -> Trader
         new_trader = Trader(name=name, role=role)
         session.add(new_trader)
 
-        result = await session.execute(select(Symbol))
-        symbols = result.scalars().all()
-        
-        for symbol in symbols:
-            position = Position(trader=new_trader, symbol=symbol, quantity=0.0)
-            session.add(position)
+        await session.flush()
+
+        result = await session.execute(select(Symbol.ticker))
+        positions = [
+            {'trader_id': new_trader.id, 'symbol_ticker': ticker, 'quantity': 0}
+            for ticker in result.scalars().all()
+        ]
+        await __create_positions(session, positions)
 
         await session.commit()
         await session.refresh(new_trader)
@@ -36,18 +46,39 @@ async def get_trader(trader_id: str) -> Optional[Trader]:
     """Get trader by ID."""
     async with async_session_maker() as session:
         trader_uuid = uuid.UUID(trader_id)
-        query = select(Trader).where(Trader.id == trader_uuid)
+        query = lambda_stmt(lambda: select(Trader).where(Trader.id == trader_uuid))
         result = await session.execute(query)
         return result.scalars().first()
 
 
-async def apply_trader_api_key(trader_id: str, api_key: str) -> Trader:
+async def get_cached_trader(trader_id: str) -> Optional[Trader]:
+    """Get trader by ID, serving recently seen traders from the in-process cache."""
+    trader = _trader_cache.get(trader_id)
+    if trader is None:
+        trader = await get_trader(trader_id)
+        if trader is not None:
+            _trader_cache[trader_id] = trader
+    return trader
+
+
+def invalidate_cached_trader(*trader_ids: Union[uuid.UUID, str]) -> None:
+    """Drop traders from the cache after their data has changed."""
+    for trader_id in trader_ids:
+        _trader_cache.pop(str(trader_id), None)
+
+
+async def apply_trader_api_key(trader_id: uuid.UUID, api_key: str) -> Optional[Trader]:
     """Update trader's API key."""
     async with async_session_maker() as session:
-        trader = await get_trader(trader_id)
-        trader.api_key = api_key
-        session.add(trader)
+        query = (
+            update(Trader)
+            .where(Trader.id == trader_id)
+            .values(api_key=api_key)
+            .returning(Trader)
+        )
+        trader = (await session.execute(query)).scalar_one_or_none()
         await session.commit()
+        invalidate_cached_trader(trader_id)
         return trader
 
 
@@ -59,67 +90,99 @@ async def delete_trader(trader_id: str) -> Optional[Trader]:
             raise HTTPException(status_code=404, detail='Пользователь с таким id не найден')
         await session.delete(trader)
         await session.commit()
+        invalidate_cached_trader(trader_id)
         return trader
 
 
 async def change_trader_balance(
-    trader_id: Union[uuid.UUID, str],
+    trader_id: uuid.UUID,
     symbol_ticker: str,
     amount: int
-) -> Optional[Trader]:
-    """Change trader's balance or position for a symbol."""
+) -> bool:
+    """
+    Change trader's balance or position for a symbol in a single statement.
+
+    Returns False if the trader does not exist.
+    """
+    if symbol_ticker == BASE_CURRENCY_TICKER:
+        query = __build_balance_update(trader_id, symbol_ticker, amount)
+    else:
+        insert_query = pg_insert(Position).values(
+            trader_id=trader_id,
+            symbol_ticker=symbol_ticker,
+            quantity=amount
+        )
+        query = insert_query.on_conflict_do_update(
+            index_elements=[Position.trader_id, Position.symbol_ticker],
+            set_={'quantity': Position.quantity + insert_query.excluded.quantity}
+        ).returning(Position.quantity)
+
     async with async_session_maker() as session:
-        trader = await __change_balance(session, trader_id, symbol_ticker, amount)
+        try:
+            new_balance = (await session.execute(query)).scalar_one_or_none()
+        except IntegrityError:
+            # Position insert referencing an unknown trader
+            return False
+        if new_balance is None:
+            # The guarded UPDATE matches no row for an unknown trader or an overdraw
+            trader_exists = (await session.execute(select(Trader.id).where(Trader.id == trader_id))).first()
+            if trader_exists is None:
+                return False
+            raise HTTPException(status_code=400, detail='Balance must be >= 0')
+        if new_balance < 0:
+            raise HTTPException(status_code=400, detail='Balance must be >= 0')
         await session.commit()
-        await session.refresh(trader)
-        return trader
 
+    invalidate_cached_trader(trader_id)
+    return True
 
-async def __change_balance(
-    session: AsyncSession,
-    trader_id: Union[uuid.UUID, str],
-    symbol_ticker: str,
-    amount: int
-) -> Optional[Trader]:
-    """Internal helper to change balance without committing."""
-    trader_id_str = str(trader_id)
-    
+
+def __build_balance_update(trader_id: uuid.UUID, symbol_ticker: str, amount: int) -> Update:
+    """Internal helper to build an UPDATE adding amount to a balance unless it would go negative."""
     if symbol_ticker == BASE_CURRENCY_TICKER:
-        trader = await session.get(Trader, uuid.UUID(trader_id_str))
-        if trader is None:
-            trader = await get_trader(trader_id_str)
-        
-        new_balance = trader.balance + amount
-        if new_balance < 0:
-            raise HTTPException(status_code=400, detail='Balance must be >= 0')
-        
-        trader.balance = new_balance
-        session.add(trader)
-    else:
-        query = (
-            select(Trader)
-            .where(Trader.id == uuid.UUID(trader_id_str))
-            .options(selectinload(Trader.positions))
+        return (
+            update(Trader)
+            .where(Trader.id == trader_id, Trader.balance + amount >= 0)
+            .values(balance=Trader.balance + amount)
+            .returning(Trader.balance)
         )
-        result = await session.execute(query)
-        trader = result.scalar_one_or_none()
-        
-        for position in trader.positions:
-            if position.symbol_ticker == symbol_ticker:
-                new_balance = position.quantity + amount
-                if new_balance < 0:
-                    raise HTTPException(status_code=400, detail='Balance must be >= 0')
-                
-                position.quantity = new_balance
-                session.add(position)
-                break
-
-    return trader
+    return (
+        update(Position)
+        .where(
+            Position.trader_id == trader_id,
+            Position.symbol_ticker == symbol_ticker,
+            Position.quantity + amount >= 0
+        )
+        .values(quantity=Position.quantity + amount)
+        .returning(Position.quantity)
+    )
 
 
-async def get_trader_orders(trader_id: str) -> List[Order]:
+async def __change_balance(
+    session: AsyncSession,
+    trader_id: uuid.UUID,
+    symbol_ticker: str,
+    amount: int
+) -> int:
+    """Internal helper to change balance atomically without committing."""
+    new_balance = (await session.execute(__build_balance_update(trader_id, symbol_ticker, amount))).scalar()
+    if new_balance is None:
+        raise HTTPException(status_code=400, detail='Balance must be >= 0')
+    return new_balance
+
+
+async def __get_trader_orders(session: AsyncSession, trader_id: uuid.UUID) -> List[Order]:
+    """Internal helper to get all orders for a trader in an existing session."""
+    query = lambda_stmt(
+        lambda: select(Order)
+        .where(Order.trader_id == trader_id)
+        .options(raiseload('*'))
+    )
+    result = await session.execute(query)
+    return result.scalars().all()
+
+
+async def get_trader_orders(trader_id: uuid.UUID) -> List[Order]:
     """Get all orders for a trader."""
     async with async_session_maker() as session:
-        query = select(Order).where(Order.trader_id == uuid.UUID(trader_id))
-        result = await session.execute(query)
-        return result.scalars().all()
+        return await __get_trader_orders(session, trader_id)
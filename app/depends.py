@@ -2,8 +2,9 @@ import uuid
 
 from fastapi import HTTPException
 
+from api.v1.admin.schemas import BalanceChangeRequest
 from db_utils.symbol import get_symbol_by_ticker
-from db_utils.trader import get_trader
+from db_utils.trader import get_trader, BASE_CURRENCY_TICKER
 from alchemy.models import Symbol, Trader
 
 
@@ -15,6 +16,13 @@ async def get_symbol_depend(ticker: str) -> Symbol:
     return symbol
 
 
+async def get_balance_change_depend(balance_data: BalanceChangeRequest) -> BalanceChangeRequest:
+    """Dependency to validate the ticker of a balance change request body."""
+    if balance_data.ticker != BASE_CURRENCY_TICKER:
+        await get_symbol_depend(balance_data.ticker)
+    return balance_data
+
+
 async def get_trader_depend(trader_id: uuid.UUID) -> Trader:
     """Dependency to get trader by ID from path parameter."""
     trader = await get_trader(str(trader_id))
@@ -1,4 +1,6 @@
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from dotenv import load_dotenv
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -8,10 +10,20 @@ load_dotenv('.env')
 
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from api.router import router
 
-logging.basicConfig(level=logging.ERROR)
+# Handlers run on the listener thread so logging never blocks the event loop
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, logging.StreamHandler())
+logging.basicConfig(level=logging.ERROR, handlers=[QueueHandler(log_queue)])
+# Rejected orders are logged as warnings
+logging.getLogger('db_utils').setLevel(logging.WARNING)
+# With log_config=None uvicorn adds no handlers of its own, so its loggers propagate to the queue
+logging.getLogger('uvicorn').setLevel(logging.INFO)
+log_listener.start()
 logger = logging.getLogger(__name__)
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 app.include_router(router, prefix='/api')
-uvicorn.run(app, host="0.0.0.0", port=8000)
+uvicorn.run(app, host="0.0.0.0", port=8000, log_config=None)
+log_listener.stop()